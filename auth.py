@@ -1,36 +1,72 @@
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
+from datetime import datetime, timedelta, timezone
 import os
-import pickle
-from constants import GOOGLE_CALENDAR_SCOPES
+import orjson
+from constants import (
+    CREDENTIALS_FILE,
+    GOOGLE_CALENDAR_SCOPES,
+    TMP_CREDENTIALS_PATH,
+    TMP_TOKEN_PATH,
+    TOKEN_REFRESH_MINUTES
+)
+
+# Credentials survive across warm Lambda invocations
+_CACHED_CREDS = None
+
+def save_credentials(creds, token_path):
+    """Atomically write credentials to token_path, readable by owner only."""
+    tmp_path = token_path + '.tmp'
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    # Creation mode is subject to umask; enforce 0600 on reused tmp files too
+    os.fchmod(fd, 0o600)
+    with os.fdopen(fd, 'w') as token:
+        token.write(creds.to_json())
+    # Rename is atomic, so readers never see a partially written token
+    os.replace(tmp_path, token_path)
+
+def _expires_soon(creds):
+    """Check whether creds expire within the refresh margin."""
+    if creds.expiry is None:
+        return False
+    # google-auth stores expiry as naive UTC
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return creds.expiry - now < timedelta(minutes=TOKEN_REFRESH_MINUTES)
 
 def get_credentials():
-    """Gets valid user credentials from storage.
+    """Gets valid user credentials from memory or storage.
     
     Returns:
         Credentials, the obtained credential.
     """
+    global _CACHED_CREDS
+    if (_CACHED_CREDS is not None and _CACHED_CREDS.valid
+            and not _expires_soon(_CACHED_CREDS)):
+        return _CACHED_CREDS
+    
     # Use /tmp directory for Lambda
-    token_path = '/tmp/token.pickle'
-    creds = None
+    token_path = TMP_TOKEN_PATH
+    creds = _CACHED_CREDS
     
-    if os.path.exists(token_path):
+    if creds is None and os.path.exists(token_path):
         with open(token_path, 'rb') as token:
-            creds = pickle.load(token)
+            creds = Credentials.from_authorized_user_info(
+                orjson.loads(token.read()), GOOGLE_CALENDAR_SCOPES)
     
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
+    # Refresh ahead of expiry so handlers don't pay for it mid-request
+    if not creds or not creds.valid or (creds.refresh_token and _expires_soon(creds)):
+        if creds and creds.refresh_token:
             creds.refresh(Request())
         else:
             # For local development, fall back to project directory
-            creds_file = ('credentials.json' if os.path.exists('credentials.json') 
-                         else '/tmp/credentials.json')
+            creds_file = (CREDENTIALS_FILE if os.path.exists(CREDENTIALS_FILE) 
+                         else TMP_CREDENTIALS_PATH)
             flow = InstalledAppFlow.from_client_secrets_file(
                 creds_file, GOOGLE_CALENDAR_SCOPES)
             creds = flow.run_local_server(port=0)
         # Save to /tmp for Lambda
-        with open(token_path, 'wb') as token:
-            pickle.dump(creds, token)
+        save_credentials(creds, token_path)
     
-    return creds 
\ No newline at end of file
+    _CACHED_CREDS = creds
+    return creds
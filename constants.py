@@ -9,11 +9,18 @@ CALENDAR_ID = 'fb2a6f4673e36a5dbba5c1540d3ad0ae5c9860cd891e53bb277dbab29bbc6b84@
 DEFAULT_START_HOUR = 9  # 9 AM
 DEFAULT_END_HOUR = 17   # 5 PM
 
+# Auth Settings
+TOKEN_REFRESH_MINUTES = 5  # Refresh access tokens this long before they expire
+
 # API Scopes
-GOOGLE_CALENDAR_SCOPES = [
+GOOGLE_CALENDAR_SCOPES = (
     'https://www.googleapis.com/auth/calendar',
     'https://www.googleapis.com/auth/calendar.events'
-]
+)
 
 # File Paths
-CREDENTIALS_FILE = 'credentials.json'
\ No newline at end of file
+CREDENTIALS_FILE = 'credentials.json'
+TOKEN_FILE = 'token.json'
+# Lambda can only write to /tmp
+TMP_CREDENTIALS_PATH = '/tmp/credentials.json'
+TMP_TOKEN_PATH = '/tmp/token.json'
\ No newline at end of file
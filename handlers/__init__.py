@@ -6,13 +6,18 @@ from .appointment_handlers import (
     handle_reschedule_appointment
 )
 
-# Map operations to their handlers
+# Map operations to (required event fields, handler).
+# Handlers return {'statusCode', 'body'} with an unserialized body;
+# lambda_handler is the only place responses are JSON encoded.
 HANDLERS = {
-    'book_appointment': handle_book_appointment,
-    'get_availability': handle_get_availability,
-    'get_appointments': handle_get_appointments,
-    'cancel_appointment': handle_cancel_appointment,
-    'reschedule_appointment': handle_reschedule_appointment
+    'book_appointment': (('name', 'timestamp', 'phone_number'), handle_book_appointment),
+    'get_availability': ((), handle_get_availability),
+    'get_appointments': (('phone_number',), handle_get_appointments),
+    'cancel_appointment': (('timestamp', 'phone_number'), handle_cancel_appointment),
+    'reschedule_appointment': (
+        ('name', 'phone_number', 'old_timestamp', 'new_timestamp'),
+        handle_reschedule_appointment
+    )
 } 
 
-PLATFORMS = ['google']
\ No newline at end of file
+PLATFORMS = frozenset({'google'})
\ No newline at end of file
@@ -1,6 +1,24 @@
 from typing import Any, Dict
 from platforms.platform_factory import PlatformFactory
-import json
+import functools
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Platform instances (and their API clients) are reused across warm invocations
+@functools.lru_cache(maxsize=4)
+def _create_platform(platform_name: str) -> Any:
+    """Return a cached platform instance, creating it on first use."""
+    return PlatformFactory.get_platform(platform_name)
+
+def _get_platform(platform_name: str) -> Any:
+    """Return the cached platform with credentials refreshed for this invocation."""
+    platform = _create_platform(platform_name)
+    platform.refresh_credentials()
+    return platform
+
+# Required event fields are checked against HANDLERS before a handler runs,
+# so handlers index them directly and only use .get() for optional fields
 
 def handle_book_appointment(event: Dict[str, Any], platform_name: str) -> Dict[str, Any]:
     """
@@ -12,7 +30,7 @@ def handle_book_appointment(event: Dict[str, Any], platform_name: str) -> Dict[s
             - timestamp: String in format 'YYYY-MM-DDTHH:MM:SS', desired appointment time
             - phone_number: String, customer's phone number
             - duration: Integer (optional), appointment duration in minutes, defaults to 30
-        "platform_name": String, name of the calendar platform to use. Key not value
+        platform_name: String, name of the calendar platform to use
     
     Returns:
         Dict containing:
@@ -24,19 +42,14 @@ def handle_book_appointment(event: Dict[str, Any], platform_name: str) -> Dict[s
                 - event_link: String (if success), URL to the calendar event
                 - available_slots: List (if booking failed), alternative available time slots
     """
-    print(event)
-    name = event.get('name')
-    timestamp = event.get('timestamp')
-    phone_number = event.get('phone_number')
-    duration = event.get('duration', 30)
-    
-    if not all([name, timestamp, phone_number]):
-        return {
-            'statusCode': 400,
-            'body': 'Name, timestamp, and phone number are required'
-        }
-    
-    platform = PlatformFactory.get_platform(platform_name)
+    logger.debug("Book appointment event: %s", event)
+    name = event['name']
+    timestamp = event['timestamp']
+    phone_number = event['phone_number']
+    # Function-call arguments may arrive as strings; bad values raise ValueError (400)
+    duration = int(event.get('duration', 30))
+    
+    platform = _get_platform(platform_name)
     result = platform.book_appointment(
         name=name,
         timestamp=timestamp,
@@ -65,10 +78,11 @@ def handle_get_availability(event: Dict[str, Any], platform_name: str) -> Dict[s
             - statusCode: Integer HTTP status code
             - body: Dict containing availability information
     """
-    platform = PlatformFactory.get_platform(platform_name)
+    platform = _get_platform(platform_name)
     
     # Get optional parameters
-    duration = event.get('duration', 30)
+    # Function-call arguments may arrive as strings; bad values raise ValueError (400)
+    duration = int(event.get('duration', 30))
     date = event.get('date')
     
     if date:
@@ -103,15 +117,9 @@ def handle_get_appointments(event: Dict[str, Any], platform_name: str) -> Dict[s
                     - name: String, customer's name
                     - event_id: String, unique identifier for the appointment
     """
-    phone_number = event.get('phone_number')
-    
-    if not phone_number:
-        return {
-            'statusCode': 400,
-            'body': 'Phone number is required'
-        }
+    phone_number = event['phone_number']
     
-    platform = PlatformFactory.get_platform(platform_name)
+    platform = _get_platform(platform_name)
     result = platform.get_customer_appointments(phone_number=phone_number)
     
     return {
@@ -132,17 +140,19 @@ def handle_cancel_appointment(event, platform_type):
     Returns:
         Dict containing:
             - statusCode: Integer HTTP status code
-            - body: JSON string containing operation result
+            - body: Dict containing:
+                - success: Boolean indicating if cancellation was successful
+                - message: String description of result
     """
-    platform = PlatformFactory.get_platform(platform_type)
+    platform = _get_platform(platform_type)
     result = platform.cancel_appointment(
-        timestamp=event.get('timestamp'),
-        phone_number=event.get('phone_number')
+        timestamp=event['timestamp'],
+        phone_number=event['phone_number']
     )
     
     return {
-        'statusCode': 200,  # Changed from 400 to 200
-        'body': json.dumps(result)
+        'statusCode': 200,
+        'body': result
     }
 
 def handle_reschedule_appointment(event: Dict[str, Any], platform_name: str) -> Dict[str, Any]:
@@ -167,18 +177,12 @@ def handle_reschedule_appointment(event: Dict[str, Any], platform_name: str) ->
                 - event_link: String (if success), URL to the new calendar event
                 - available_slots: List (if new time unavailable), alternative available time slots
     """
-    name = event.get('name')
-    phone_number = event.get('phone_number')
-    old_timestamp = event.get('old_timestamp')
-    new_timestamp = event.get('new_timestamp')
-    
-    if not all([name, phone_number, old_timestamp, new_timestamp]):
-        return {
-            'statusCode': 400,
-            'body': 'Name, phone number, old timestamp, and new timestamp are required'
-        }
-    
-    platform = PlatformFactory.get_platform(platform_name)
+    name = event['name']
+    phone_number = event['phone_number']
+    old_timestamp = event['old_timestamp']
+    new_timestamp = event['new_timestamp']
+    
+    platform = _get_platform(platform_name)
     result = platform.reschedule_appointment(
         name=name,
         phone_number=phone_number,
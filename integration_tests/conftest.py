@@ -0,0 +1,186 @@
+"""
+Shared fixtures for the Google Calendar integration tests.
+
+The tests are network-bound and can run in parallel with pytest-xdist
+(pip install pytest-xdist). Every test books into the same real calendar,
+so each worker gets its own phone number and its own slot tomorrow. Tests
+that need tomorrow's calendar to be empty are marked ``serial``:
+
+    pytest -n 4 -m "not serial" integration_tests/
+    pytest -m serial integration_tests/
+
+HTTP traffic is recorded to cassettes with pytest-recording
+(pip install pytest-recording). The first run against the live calendar
+writes integration_tests/cassettes/; later runs replay them without network.
+Use --disable-recording for a true live run, and --record-mode=rewrite to
+refresh the cassettes. OAuth tokens and other customers' event details are
+redacted before anything is written.
+
+The clock is frozen at FROZEN_NOW with freezegun (pip install freezegun) so
+every run sends the same timeMin/timeMax values and replays match the
+cassettes. OAuth token handling still sees the real clock.
+"""
+import sys
+import os
+import pathlib
+# Don't write .pyc files for the project modules imported below
+sys.dont_write_bytecode = True
+# Add project root to Python path once for every integration test module
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import pytest
+import json
+import logging
+from datetime import datetime, timedelta
+from freezegun import freeze_time
+from constants import CALENDAR_ID, DEFAULT_START_HOUR, DEFAULT_END_HOUR
+
+# One stdout handler for every test module
+logging.basicConfig(
+    level=logging.INFO,
+    stream=sys.stdout,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "serial: needs an empty calendar; exclude from pytest-xdist runs"
+    )
+
+# Test bookings use synthetic numbers (see phone_number); anything else in a
+# recorded listing is a real customer's event
+_TEST_PHONE_PREFIXES = ('+1234567', '+0987654321')
+# Token endpoint response fields that must never reach a cassette
+_TOKEN_FIELDS = ('access_token', 'id_token', 'refresh_token')
+# Event fields that can carry customer names, emails or phone numbers
+_PII_EVENT_FIELDS = ('attendees', 'creator', 'organizer')
+
+def _is_test_event(event):
+    """Check whether an event was booked by these tests"""
+    description = event.get('description', '')
+    return any(description.startswith(f'Phone: {prefix}') for prefix in _TEST_PHONE_PREFIXES)
+
+def _scrub_response(response):
+    """Redact OAuth tokens and real customers' details from a recorded response"""
+    content_type = ''.join(
+        ''.join(value) for key, value in response['headers'].items()
+        if key.lower() == 'content-type'
+    )
+    if 'application/json' not in content_type or not response['body']['string']:
+        return response
+
+    body = json.loads(response['body']['string'])
+    for field in _TOKEN_FIELDS:
+        if field in body:
+            body[field] = 'REDACTED'
+    for event in body.get('items', []):
+        for field in _PII_EVENT_FIELDS:
+            event.pop(field, None)
+        if not _is_test_event(event):
+            # Only the event's times matter for availability and conflicts
+            event['summary'] = 'Busy'
+            event['description'] = 'REDACTED'
+    response['body']['string'] = json.dumps(body).encode()
+    return response
+
+@pytest.fixture(scope="module")
+def vcr_config():
+    """Record new interactions once and keep OAuth secrets and customer data out of the cassettes"""
+    return {
+        "record_mode": "once",
+        "filter_headers": ["authorization"],
+        "filter_post_data_parameters": ["client_id", "client_secret", "refresh_token"],
+        "before_record_response": _scrub_response,
+        "decode_compressed_response": True,
+    }
+
+# Friday 10AM; "tomorrow" is then Saturday February 08
+FROZEN_NOW = "2025-02-07 10:00:00"
+
+@pytest.fixture(scope="session", autouse=True)
+def frozen_now():
+    """Freeze datetime.now()/utcnow() for the whole session"""
+    # Token expiry checks need real time or live runs would send stale tokens
+    with freeze_time(FROZEN_NOW, ignore=['auth', 'google.auth', 'google.oauth2']) as frozen:
+        yield frozen
+
+@pytest.fixture(scope="session")
+def worker_index():
+    """Index of the pytest-xdist worker (gw0 -> 0), or 0 without xdist"""
+    worker = os.environ.get('PYTEST_XDIST_WORKER', 'gw0')
+    return int(worker[2:])
+
+@pytest.fixture(scope="session")
+def phone_number(worker_index):
+    """Per-worker phone number so parallel tests never see each other's appointments"""
+    return f"{_TEST_PHONE_PREFIXES[0]}{890 + worker_index:03d}"
+
+@pytest.fixture(scope="session")
+def tomorrow(frozen_now):
+    """Midnight at the start of tomorrow, computed once per test session"""
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+@pytest.fixture(scope="session")
+def business_timestamps(tomorrow, worker_index):
+    """
+    Timestamps for this worker's slot tomorrow and the day after.
+    
+    Worker N books the Nth half-hour slot starting an hour after opening, so
+    workers never collide; running more workers than slots fails early.
+    
+    Returns:
+        tuple of two strings in format 'YYYY-MM-DDTHH:MM:SS'
+    """
+    # 30-minute bookings from an hour after opening until closing
+    slot_count = (DEFAULT_END_HOUR - DEFAULT_START_HOUR - 1) * 2
+    if worker_index >= slot_count:
+        pytest.fail(
+            f"Worker gw{worker_index} has no free business-hour slot; "
+            f"run with at most -n {slot_count}"
+        )
+    tomorrow_time = tomorrow + timedelta(hours=DEFAULT_START_HOUR + 1, minutes=30 * worker_index)
+    day_after_time = tomorrow_time + timedelta(days=1)
+    return tomorrow_time.isoformat(), day_after_time.isoformat()
+
+@pytest.fixture
+def booked_appointments(phone_number):
+    """
+    Timestamps this test books for phone_number, deleted at teardown.
+    
+    Tests share one slot per worker, so cleanup stays per test, but it costs
+    one events().list for the whole span plus one batch request per 50
+    deletes instead of a list + delete round trip per timestamp.
+    
+    Yields:
+        set of timestamp strings in format 'YYYY-MM-DDTHH:MM:SS'
+    """
+    timestamps = set()
+    yield timestamps
+    if not timestamps:
+        return
+
+    from handlers.appointment_handlers import _get_platform
+    platform = _get_platform('google')
+    targets = {datetime.fromisoformat(ts) for ts in timestamps}
+    start_of_span = min(targets).replace(hour=0, minute=0, second=0, microsecond=0)
+    end_of_span = max(targets).replace(hour=23, minute=59, second=59, microsecond=999999)
+
+    events_result = platform.service.events().list(
+        calendarId=CALENDAR_ID,
+        timeMin=platform._format_datetime_for_google(start_of_span),
+        timeMax=platform._format_datetime_for_google(end_of_span),
+        singleEvents=True
+    ).execute()
+    event_ids = [
+        event['id'] for event in events_result.get('items', [])
+        if f'Phone: {phone_number}' in event.get('description', '')
+        and platform._strip_timezone(event['start']['dateTime']) in targets
+    ]
+    logging.getLogger(__name__).info("Cleaning up %d test appointment(s)", len(event_ids))
+
+    # The Calendar API accepts at most 50 calls per batch request
+    for i in range(0, len(event_ids), 50):
+        batch = platform.service.new_batch_http_request()
+        for event_id in event_ids[i:i + 50]:
+            batch.add(platform.service.events().delete(calendarId=CALENDAR_ID, eventId=event_id))
+        batch.execute()
@@ -1,6 +1,16 @@
+import sys
+# /var/task is read-only on Lambda; skip the failing .pyc write attempts
+sys.dont_write_bytecode = True
+
 from typing import Any, Dict
-import json
+import orjson
 from handlers import HANDLERS, PLATFORMS
+from constants import (
+    CREDENTIALS_FILE,
+    TMP_CREDENTIALS_PATH,
+    TMP_TOKEN_PATH,
+    TOKEN_FILE
+)
 import shutil
 import os
 import traceback
@@ -10,87 +20,85 @@ import logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+def _dumps(obj: Any) -> str:
+    """Serialize obj to a JSON str (API Gateway requires a str body)"""
+    return orjson.dumps(obj, default=str).decode()
+
+# Fixed validation errors are encoded once at import; return copies so
+# callers can't mutate the shared responses across warm invocations
+_ERR_PLATFORM_REQUIRED = {'statusCode': 400, 'body': _dumps('Platform is required')}
+_ERR_OPERATION_REQUIRED = {'statusCode': 400, 'body': _dumps('Operation is required')}
+
+def _bootstrap():
+    """Copy packaged auth files to /tmp once per container, during Lambda init"""
+    if os.path.exists(TOKEN_FILE) and not os.path.exists(TMP_TOKEN_PATH):
+        logger.info("Copying %s to /tmp", TOKEN_FILE)
+        shutil.copyfile(TOKEN_FILE, TMP_TOKEN_PATH)
+        os.chmod(TMP_TOKEN_PATH, 0o600)
+    if os.path.exists(CREDENTIALS_FILE) and not os.path.exists(TMP_CREDENTIALS_PATH):
+        logger.info("Copying %s to /tmp", CREDENTIALS_FILE)
+        shutil.copyfile(CREDENTIALS_FILE, TMP_CREDENTIALS_PATH)
+        os.chmod(TMP_CREDENTIALS_PATH, 0o600)
+
+_bootstrap()
+
 def lambda_handler(event, context):
     """Handle both direct Lambda invocations and API Gateway events"""
     try:
-        logger.info("Received event: %s", event)
-        
-        # Copy token to /tmp if it exists in the package
-        if os.path.exists('token.pickle') and not os.path.exists('/tmp/token.pickle'):
-            logger.info("Copying token.pickle to /tmp")
-            shutil.copy2('token.pickle', '/tmp/token.pickle')
-        if os.path.exists('credentials.json') and not os.path.exists('/tmp/credentials.json'):
-            logger.info("Copying credentials.json to /tmp")
-            shutil.copy2('credentials.json', '/tmp/credentials.json')
+        logger.debug("Received event: %s", event)
         
-        # Check if this is an API Gateway event
-        if 'body' in event:
-            body = json.loads(event['body'])
-            logger.info("Parsed API Gateway body: %s", body)
+        # Check if this is an API Gateway event; empty bodies skip parsing
+        body = event.get('body')
+        if body:
+            # orjson parses str and bytes directly
+            if isinstance(body, (str, bytes)):
+                body = orjson.loads(body)
+            logger.debug("Parsed API Gateway body: %s", body)
             event = body['args']
-            logger.info("Extracted args: %s", event)
+            logger.debug("Extracted args: %s", event)
 
-        # Find platform and handler
-        platform = None
-        handler = None
-        
-        # First check for platform
-        for key in event.keys():
-            if key.lower() in PLATFORMS:
-                platform = key
-                logger.info("Found platform: %s", platform)
-                break
+        # First check for platform; PLATFORMS holds lowercase names
+        platform = next((key for key in event if key.lower() in PLATFORMS), None)
                 
         if not platform:
             logger.error("No platform found in event")
-            return {
-                'statusCode': 400,
-                'body': json.dumps('Platform is required')
-            }
-            
-        event['platform_name'] = platform
-        event.pop(platform)
+            return dict(_ERR_PLATFORM_REQUIRED)
+        logger.info("Found platform: %s", platform)
         
-        # Then check for operation
-        operation = None
-        for key in event.keys():
-            if key in HANDLERS:
-                handler = HANDLERS[key]
-                operation = key
-                logger.info("Found operation: %s", operation)
-                break
+        # Then check for operation; the first one in event order wins
+        operation = next((key for key in event if key in HANDLERS), None)
         
         if not operation:
             logger.error("No operation found in event")
-            return {
-                'statusCode': 400,
-                'body': json.dumps('Operation is required')
-            }
+            return dict(_ERR_OPERATION_REQUIRED)
+        
+        logger.info("Found operation: %s", operation)
+        required_fields, handler = HANDLERS[operation]
         
-        if not handler:
-            logger.error("No handler found for operation: %s", operation)
+        missing = [field for field in required_fields if not event.get(field)]
+        if missing:
+            logger.error("Missing required fields for %s: %s", operation, missing)
             return {
                 'statusCode': 400,
-                'body': json.dumps(f'Unknown operation: {operation}')
+                'body': _dumps(f"Missing required fields: {', '.join(missing)}")
             }
 
         # Execute the handler and return result directly
         logger.info("Executing handler for operation: %s", operation)
         result = handler(event, platform)
-        logger.info("Handler result: %s", result)
+        logger.debug("Handler result: %s", result)
         
-        # Ensure body is JSON serialized
-        if isinstance(result.get('body'), (dict, list)):
-            result['body'] = json.dumps(result['body'])
+        # Handlers return unserialized bodies; encode exactly once here
+        result['body'] = _dumps(result.get('body'))
             
-        logger.info("Final formatted result: %s", result)
+        logger.debug("Final formatted result: %s", result)
         return result
         
     except ValueError as e:
         logger.error("ValueError: %s", str(e))
         return {
             'statusCode': 400,
-            'body': json.dumps(str(e))
+            'body': _dumps(str(e))
         }
     except Exception as e:
         logger.error("Error details: %s", str(e))
@@ -98,6 +106,6 @@ def lambda_handler(event, context):
         logger.error("Traceback: %s", traceback.format_exc())
         return {
             'statusCode': 500,
-            'body': json.dumps(f'Error: {str(e)}')
+            'body': _dumps(f'Error: {str(e)}')
         }
 
@@ -1,14 +1,79 @@
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
-from typing import List, Dict
+from datetime import date, datetime, timezone
+from typing import Iterable, Iterator, List, Tuple
+import bisect
+import functools
+from zoneinfo import ZoneInfo
 from constants import DEFAULT_START_HOUR, DEFAULT_END_HOUR
-import pytz
+
+# Shared tzinfo objects; zoneinfo zones are immutable and safe to reuse
+LOCAL_TZ = ZoneInfo('America/New_York')  # EST/EDT timezone
+UTC = timezone.utc
+
+# Every candidate start in business hours on the 30-minute grid, in minutes since midnight
+_SLOT_STEP = 30
+_SLOT_STARTS = tuple(range(DEFAULT_START_HOUR * 60, DEFAULT_END_HOUR * 60, _SLOT_STEP))
+
+# A day has at most 48 half-hour start times, so results are reused across invocations
+@functools.lru_cache(maxsize=128)
+def _format_time(minutes: int) -> str:
+    """
+    Convert minutes since midnight to 12-hour format with minutes when needed.
+    Examples:
+        870 (14:30) -> "2:30PM"
+        540 (09:00) -> "9AM"
+        945 (15:45) -> "3:45PM"
+        720 (12:00) -> "12PM"
+    """
+    hour, minutes = divmod(minutes, 60)
+    ampm = 'AM' if hour < 12 else 'PM'
+    hour = hour % 12 or 12
+    
+    # Only include minutes if they're not zero
+    if not minutes:
+        return f"{hour}{ampm}"
+    return f"{hour}:{minutes:02d}{ampm}"
+
+@functools.lru_cache(maxsize=256)
+def _format_date(day: date) -> str:
+    """Format a date for speech, e.g. "Monday, March 20" """
+    return day.strftime('%A, %B %d')
+
+def _describe_runs(runs: List[Tuple[int, int, int]]) -> str:
+    """
+    Describe runs of back-to-back slots in natural language.
+    
+    Args:
+        runs: List of (first_start, last_start, count) in minutes since midnight
+    
+    Returns:
+        str: e.g. "9AM, 9:30AM, from 10:30AM to 12PM"
+    """
+    time_strings = []
+    for first, last, count in runs:
+        if count >= 3:
+            # For 3 or more consecutive slots, show range up to the last slot's start
+            time_strings.append(f"from {_format_time(first)} to {_format_time(last)}")
+        else:
+            # For individual or small groups, show each slot's start time
+            time_strings.append(_format_time(first))
+            if count == 2:
+                time_strings.append(_format_time(last))
+    
+    # Combine all times with commas
+    return ", ".join(time_strings)
 
 class BookingPlatform(ABC):
     """Base class for all booking platform integrations"""
     
+    # Subclasses declare __slots__ for their own attributes to stay dict-free
+    __slots__ = ('timezone',)
+    
     def __init__(self):
-        self.timezone = pytz.timezone('America/New_York')  # EST/EDT timezone
+        self.timezone = LOCAL_TZ
+    
+    def refresh_credentials(self) -> None:
+        """Refresh API credentials that are expired or about to expire; no-op by default"""
     
     def _strip_timezone(self, dt_str: str) -> datetime:
         """
@@ -24,7 +89,7 @@ class BookingPlatform(ABC):
         
         # Convert to EST
         if utc_dt.tzinfo is None:
-            utc_dt = pytz.utc.localize(utc_dt)
+            utc_dt = utc_dt.replace(tzinfo=UTC)
         local_dt = utc_dt.astimezone(self.timezone)
         
         # Return naive datetime in local time
@@ -103,80 +168,34 @@ class BookingPlatform(ABC):
         """
         pass
     
-    def _combine_events(self, slots: List[Dict[str, str]], date: str, duration: int = 30) -> str:
+    @staticmethod
+    def _sweep_free_starts(slot_starts: Iterable[int], booked_slots: List[Tuple[int, int]],
+                           duration: int) -> Iterator[int]:
         """
-        Combines 4 or more consecutive time slots and returns a natural language description.
-        Single slots are shown as start time only, consecutive slots shown as range.
+        Yield the candidate slot starts that don't overlap any booked slot.
         
         Args:
-            slots: List of dicts with 'start' and 'end' times in 'HH:MM' format
-            date: String date in format 'YYYY-MM-DD'
-            duration: Integer minutes for appointment duration (default 30)
-        
-        Returns:
-            str: Natural language description of available times
+            slot_starts: Ascending candidate starts in minutes since midnight
+            booked_slots: (start, end) booked intervals in minutes, in any order
+            duration: Integer minutes for appointment duration
         """
-        if not slots:
-            return "No available times found"
-        
-        # Format the date
-        date_obj = datetime.strptime(date, '%Y-%m-%d')
-        # Sort slots by start time
-        sorted_slots = sorted(slots, key=lambda x: x['start'])
-        
-
-        # Convert time to 12-hour format
-        def format_time(time_str: str) -> str:
-            """
-            Convert 24-hour time string to 12-hour format with minutes when needed.
-            Examples:
-                "14:30" -> "2:30PM"
-                "09:00" -> "9AM"
-                "15:45" -> "3:45PM"
-                "12:00" -> "12PM"
-            """
-            time_obj = datetime.strptime(time_str, '%H:%M')
-            hour = time_obj.strftime('%I').lstrip('0')  # Remove leading zero
-            minutes = time_obj.strftime('%M')
-            ampm = time_obj.strftime('%p')
-            
-            # Only include minutes if they're not zero
-            if minutes == '00':
-                return f"{hour}{ampm}"
-            return f"{hour}:{minutes}{ampm}"
-        
-        # Group consecutive slots
-        groups = []
-        current_group = [sorted_slots[0]]
-        
-        for i in range(1, len(sorted_slots)):
-            # Check if current slot starts when previous slot ends
-            if sorted_slots[i]['start'] == current_group[-1]['end']:
-                current_group.append(sorted_slots[i])
-            else:
-                groups.append(current_group)
-                current_group = [sorted_slots[i]]
-        groups.append(current_group)  # Add the last group
-        
-        # Format each group into a string
-        time_strings = []
-        for group in groups:
-            if len(group) >= 3:
-                # For 4 or more consecutive slots, show range
-                start = format_time(group[0]['start'])
-                # Get the start time of last slot
-                end = format_time(group[-1]['start'])
-                time_strings.append(f"from {start} to {end}")
+        # Sort and merge booked slots so one forward pointer can sweep them
+        booked_slots = sorted(booked_slots)
+        merged_slots = []
+        for booked_start, booked_end in booked_slots:
+            if merged_slots and booked_start <= merged_slots[-1][1]:
+                merged_slots[-1][1] = max(merged_slots[-1][1], booked_end)
             else:
-                # For individual or small groups, show each slot's start time
-                for slot in group:
-                    time_strings.append(format_time(slot['start']))
+                merged_slots.append([booked_start, booked_end])
         
-        # Combine all times with commas
-        times = ", ".join(time_strings)
-        
-        # Ternary operator: condition_if_true if condition else condition_if_false
-        return times
+        i = 0
+        for slot_start in slot_starts:
+            # Skip booked slots that end before this candidate starts
+            while i < len(merged_slots) and merged_slots[i][1] <= slot_start:
+                i += 1
+            # Only the next booked slot can overlap the candidate
+            if i == len(merged_slots) or slot_start + duration <= merged_slots[i][0]:
+                yield slot_start
     
     def get_available_times(self, timestamp: str, booking_result: dict, duration: int = 30) -> dict:
         """
@@ -192,32 +211,27 @@ class BookingPlatform(ABC):
                 slots: List of available time slots
                 date: String date in format 'YYYY-MM-DD'
         """
-        # Parse the requested date from timestamp
-        requested_date = datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S')
+        # Parse the requested date from timestamp; callers pass validated
+        # 'YYYY-MM-DDTHH:MM:SS' strings, which fromisoformat parses in C
+        requested_date = datetime.fromisoformat(timestamp)
+        date_str = requested_date.date().isoformat()  # 'YYYY-MM-DD'
         
-        # Get all booked slots for the day
+        # Booked intervals as minutes since midnight
         booked_slots = []
         if booking_result.get('bookedEvents') and booking_result['bookedEvents'].get('items'):
             for event in booking_result['bookedEvents']['items']:
                 if 'dateTime' in event['start']:  # Skip all-day events
                     start = self._strip_timezone(event['start']['dateTime'])
                     end = self._strip_timezone(event['end']['dateTime'])
-                    booked_slots.append((start.strftime('%H:%M'), end.strftime('%H:%M')))
-        
-        # Generate all possible time slots between business hours
-        available_slots = []
-        current_time = requested_date.replace(
-            hour=DEFAULT_START_HOUR, 
-            minute=0, 
-            second=0, 
-            microsecond=0
-        )
-        end_of_day = requested_date.replace(
-            hour=DEFAULT_END_HOUR, 
-            minute=0, 
-            second=0, 
-            microsecond=0
-        )
+                    start_min = start.hour * 60 + start.minute
+                    end_min = end.hour * 60 + end.minute
+                    if end.date() > start.date():
+                        # Event crosses midnight; clip it to the requested day
+                        if start.date() < requested_date.date():
+                            start_min = 0
+                        if end.date() > requested_date.date():
+                            end_min = 24 * 60
+                    booked_slots.append((start_min, end_min))
         
         # Get current time in platform's timezone (Eastern)
         now = datetime.now(self.timezone).replace(tzinfo=None)
@@ -227,63 +241,47 @@ class BookingPlatform(ABC):
         if requested_date.date() < today:
             return {
                 'message': f"Requested date is before today. Can you please provide a date on or after today?",
-                'date': requested_date.strftime('%Y-%m-%d'),
+                'date': date_str,
             }
         
-        while current_time < end_of_day:
+        # Candidate slots must end by closing time
+        lo = 0
+        hi = bisect.bisect_right(_SLOT_STARTS, DEFAULT_END_HOUR * 60 - duration)
+        if requested_date.date() == today:
             # Skip slots that are in the past for today
-            if requested_date.date() == today and current_time <= now:
-                current_time += timedelta(minutes=30)
-                continue
-                
-            slot_end = current_time + timedelta(minutes=duration)
-            if slot_end <= end_of_day:
-                # Check if this slot overlaps with any booked slots
-                candidate_start = current_time.strftime('%H:%M')
-                candidate_end = slot_end.strftime('%H:%M')
-                slot_is_available = True
-                
-                for booked_start, booked_end in booked_slots:
-                    # Check all possible overlap cases:
-                    # 1. Candidate starts during booked slot
-                    # 2. Candidate ends during booked slot
-                    # 3. Candidate contains booked slot
-                    # 4. Booked slot contains candidate
-                    if (candidate_start >= booked_start and candidate_start < booked_end) or \
-                       (candidate_end > booked_start and candidate_end <= booked_end) or \
-                       (candidate_start <= booked_start and candidate_end >= booked_end) or \
-                       (booked_start <= candidate_start and booked_end >= candidate_end):
-                        slot_is_available = False
-                        break
-                
-                if slot_is_available:
-                    available_slots.append({
-                        'start': candidate_start,
-                        'end': candidate_end
-                    })
+            lo = bisect.bisect_right(_SLOT_STARTS, now.hour * 60 + now.minute)
+        slot_starts = _SLOT_STARTS[lo:hi]
+        
+        if not booked_slots and duration == _SLOT_STEP:
+            # Nothing booked and slots tile the grid: the candidates are one run
+            runs = [(slot_starts[0], slot_starts[-1], len(slot_starts))] if slot_starts else []
+        else:
+            if booked_slots:
+                free_starts = self._sweep_free_starts(slot_starts, booked_slots, duration)
+            else:
+                # Nothing booked: every candidate is free
+                free_starts = slot_starts
             
-            current_time += timedelta(minutes=30)  # Move to next slot
+            # Group free slots into runs as the sweep yields them, in one pass
+            runs = []
+            for slot_start in free_starts:
+                if runs and runs[-1][1] + duration == slot_start:
+                    first, _, count = runs[-1]
+                    runs[-1] = (first, slot_start, count + 1)
+                else:
+                    runs.append((slot_start, slot_start, 1))
         
-        stripped_date = requested_date.strftime('%Y-%m-%d')
-        # Get available slots
-        combined_slots = self._combine_events(
-            available_slots, 
-            stripped_date,
-            duration
-        )   
-        # Convert string date back to datetime for formatting
-        date_obj = datetime.strptime(stripped_date, '%Y-%m-%d')
-        formatted_date = date_obj.strftime('%A, %B %d')  # e.g. "Monday, March 20"
+        formatted_date = _format_date(requested_date.date())
         availability_found = False
-        if available_slots:
-            message = f"Available {formatted_date}: {combined_slots}"
+        if runs:
+            message = f"Available {formatted_date}: {_describe_runs(runs)}"
             availability_found = True
         else:
             message = f"No available times found on {formatted_date}"
         
         return {
             'message': message,
-            'date': requested_date.strftime('%Y-%m-%d'),
+            'date': date_str,
             'availability_found': availability_found
         }
     
@@ -1,7 +1,7 @@
-from datetime import datetime, timedelta
-import pytz
+from datetime import datetime, time, timedelta
+import logging
 from googleapiclient.discovery import build
-from .base_platform import BookingPlatform
+from .base_platform import BookingPlatform, LOCAL_TZ, UTC
 from constants import (
     CALENDAR_ID,
     DEFAULT_START_HOUR,
@@ -9,46 +9,115 @@ from constants import (
 )
 from auth import get_credentials
 
+logger = logging.getLogger(__name__)
+
+# Only the event fields the platform reads; shrinks every listing response
+_EVENT_LIST_FIELDS = 'nextPageToken,items(id,summary,description,start,end)'
+# Largest page events().list will return
+_MAX_RESULTS = 2500
+# Retries, with exponential backoff, for read-only calls that hit 5xx/429;
+# writes are not retried so a lost response cannot double-book
+_READ_RETRIES = 3
+# Local day boundaries; listings span [midnight, next midnight)
+_MIDNIGHT = time(0)
+_ONE_DAY = timedelta(days=1)
+
 class GoogleCalendarPlatform(BookingPlatform):
+    __slots__ = ('service', '_creds')
+    
     def __init__(self, test_mode=False):
         """Initialize the platform
         
         Args:
             test_mode: If True, skip authentication (for unit tests)
         """
+        self._creds = None
         if not test_mode:
-            creds = get_credentials()
-            self.service = build('calendar', 'v3', credentials=creds)
-        self.timezone = pytz.timezone('America/New_York')  # EST/EDT timezone
+            self._creds = get_credentials()
+            # The bundled static discovery doc is used; skip probing for a
+            # discovery cache backend (appengine memcache / oauth2client)
+            self.service = build('calendar', 'v3', credentials=self._creds, cache_discovery=False)
+        self.timezone = LOCAL_TZ
 
-    def _strip_timezone(self, dt_str: str) -> datetime:
-        """
-        Helper method to convert datetime string to naive datetime object in local time.
-        Handles both UTC ('Z') and offset timezone formats (e.g., '-04:00')
-        """
-        # If the string ends with 'Z', convert to offset format
-        if dt_str.endswith('Z'):
-            dt_str = dt_str.replace('Z', '+00:00')
-        
-        # Parse with timezone info
-        utc_dt = datetime.fromisoformat(dt_str)
-        
-        # Convert to EST
-        if utc_dt.tzinfo is None:
-            utc_dt = pytz.utc.localize(utc_dt)
-        local_dt = utc_dt.astimezone(self.timezone)
-        
-        # Return naive datetime in local time
-        return local_dt.replace(tzinfo=None)
+    def refresh_credentials(self) -> None:
+        """Refresh the service's credentials ahead of expiry; they are shared with auth's cache"""
+        if self._creds is not None:
+            # get_credentials refreshes the cached object in place, which is
+            # the one self.service was built with
+            get_credentials()
 
     def _format_datetime_for_google(self, dt: datetime) -> str:
         """Helper method to format local datetime for Google Calendar API (in UTC)"""
         # Make datetime timezone-aware in EST
-        local_dt = self.timezone.localize(dt)
+        local_dt = dt.replace(tzinfo=self.timezone)
         # Convert to UTC
-        utc_dt = local_dt.astimezone(pytz.UTC)
+        utc_dt = local_dt.astimezone(UTC)
         return utc_dt.strftime('%Y-%m-%dT%H:%M:%S.000Z')
 
+    def _events_list_request(self, start: datetime, end: datetime, page_token: str = None):
+        """Build the events().list request for one page of events overlapping [start, end)"""
+        return self.service.events().list(
+            calendarId=CALENDAR_ID,
+            timeMin=self._format_datetime_for_google(start),
+            timeMax=self._format_datetime_for_google(end),
+            singleEvents=True,
+            orderBy='startTime',
+            maxResults=_MAX_RESULTS,
+            pageToken=page_token,
+            fields=_EVENT_LIST_FIELDS
+        )
+
+    def _list_events(self, start: datetime, end: datetime) -> dict:
+        """List the calendar's events overlapping [start, end), following every page"""
+        result = self._events_list_request(start, end).execute(num_retries=_READ_RETRIES)
+        while result.get('nextPageToken'):
+            page = self._events_list_request(
+                start, end, page_token=result['nextPageToken']
+            ).execute(num_retries=_READ_RETRIES)
+            result['items'] = result.get('items', []) + page.get('items', [])
+            result['nextPageToken'] = page.get('nextPageToken')
+        return result
+
+    def _list_day_events(self, day: datetime) -> dict:
+        """List the calendar's events on the local day containing day"""
+        start_of_day = datetime.combine(day.date(), _MIDNIGHT)
+        return self._list_events(start_of_day, start_of_day + _ONE_DAY)
+
+    def _list_events_by_day(self, first_day: datetime, days: int) -> dict:
+        """
+        List the events of days consecutive days in one call, grouped by local date.
+        
+        An event spanning midnight is filed under every day it touches;
+        get_available_times clips it to the day being checked.
+        """
+        start = datetime.combine(first_day.date(), _MIDNIGHT)
+        events_result = self._list_events(start, start + days * _ONE_DAY)
+        
+        days_by_date = {}
+        for event in events_result.get('items', []):
+            if 'dateTime' not in event['start']:
+                continue  # Skip all-day events
+            day = self._strip_timezone(event['start']['dateTime']).date()
+            last_day = (self._strip_timezone(event['end']['dateTime']) - timedelta(microseconds=1)).date()
+            while day <= last_day:
+                days_by_date.setdefault(day, []).append(event)
+                day += _ONE_DAY
+        return days_by_date
+
+    def _has_conflict(self, events_result: dict, start_time: datetime, end_time: datetime,
+                      ignore_event_id: str = None) -> bool:
+        """Check whether any timed event overlaps [start_time, end_time)"""
+        for event in events_result.get('items', []):
+            if 'dateTime' not in event['start'] or 'dateTime' not in event['end']:
+                continue  # Skip all-day events
+            if event.get('id') is not None and event.get('id') == ignore_event_id:
+                continue
+            event_start = self._strip_timezone(event['start']['dateTime'])
+            event_end = self._strip_timezone(event['end']['dateTime'])
+            if start_time < event_end and end_time > event_start:
+                return True
+        return False
+
     def book_appointment(self, name: str, timestamp: str, phone_number: str, duration: int = 30) -> dict:
         """
         Book appointment on Google Calendar. If booking fails, returns available slots.
@@ -75,36 +144,25 @@ class GoogleCalendarPlatform(BookingPlatform):
                 'message': f'Appointments must be between {DEFAULT_START_HOUR}:00 and {DEFAULT_END_HOUR}:00'
             }
         
-        # Get existing events for the day
-        start_of_day = start_time.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_of_day = start_time.replace(hour=23, minute=59, second=59, microsecond=999999)
-        events_result = self.service.events().list(
-            calendarId=CALENDAR_ID,
-            timeMin=self._format_datetime_for_google(start_of_day),
-            timeMax=self._format_datetime_for_google(end_of_day),
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-        
-        # Check for conflicts
-        for event in events_result.get('items', []):
-            if 'dateTime' not in event['start'] or 'dateTime' not in event['end']:
-                continue  # Skip all-day events
-            event_start = self._strip_timezone(event['start']['dateTime'])
-            event_end = self._strip_timezone(event['end']['dateTime'])
-            if (start_time < event_end and end_time > event_start):
-                # Time slot is taken, get available times
-                available_times = self.get_availability(date=timestamp, duration=duration)
-                return {
-                    'success': False,
-                    'message': 'Time slot is already booked',
-                    'otherAvailableTimes': available_times['message'],
-                }
+        # Check for conflicts with events overlapping just the requested slot;
+        # the whole day is only listed if we need to offer other times
+        events_result = self._list_events(start_time, end_time)
+        if self._has_conflict(events_result, start_time, end_time):
+            # Time slot is taken, get available times
+            available_times = self.get_availability(date=timestamp, duration=duration)
+            return {
+                'success': False,
+                'message': 'Time slot is already booked',
+                'otherAvailableTimes': available_times['message'],
+            }
         
         # Create the event
         event = {
             'summary': name,
             'description': f'Phone: {phone_number}',
+            # Structured copy of the phone number for a later
+            # privateExtendedProperty lookup once older events are backfilled
+            'extendedProperties': {'private': {'phone': phone_number}},
             'start': {
                 'dateTime': self._format_datetime_for_google(start_time),
                 'timeZone': 'America/New_York',
@@ -131,7 +189,7 @@ class GoogleCalendarPlatform(BookingPlatform):
             try:
                 # Try parsing as timestamp first
                 if 'T' in date:
-                    print(f"Converting timestamp {date} to date")
+                    logger.debug("Converting timestamp %s to date", date)
                     date_to_check = datetime.strptime(date, '%Y-%m-%dT%H:%M:%S')
                 else:
                     date_to_check = datetime.strptime(date, '%Y-%m-%d')
@@ -141,34 +199,33 @@ class GoogleCalendarPlatform(BookingPlatform):
                     'message': f'Invalid date format: {str(e)}. Please use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS'
                 }
         else:
-            est = pytz.timezone('America/New_York')
-            now = datetime.now(est).replace(tzinfo=None)
-            print(f"No date provided, using today: {now}")
+            now = datetime.now(self.timezone).replace(tzinfo=None)
+            logger.debug("No date provided, using today: %s", now)
             date_to_check = now
         
         max_days_to_check = 30  # Don't look more than 1 month ahead
-        days_checked = 0
+        days_by_date = None
         
-        while days_checked < max_days_to_check:
-            # Get events for the day
-            start_of_day = date_to_check.replace(hour=0, minute=0, second=0, microsecond=0)
-            print(f"Getting availability for date {start_of_day}")
-            end_of_day = date_to_check.replace(hour=23, minute=59, second=59, microsecond=999999)
-            
-            events_result = self.service.events().list(
-                calendarId=CALENDAR_ID,
-                timeMin=self._format_datetime_for_google(start_of_day),
-                timeMax=self._format_datetime_for_google(end_of_day),
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+        for days_checked in range(1, max_days_to_check + 1):
+            if days_checked == 1:
+                # The requested day usually has times, so list just that day first
+                logger.debug("Getting availability for date %s", date_to_check.date())
+                events_result = self._list_day_events(date_to_check)
+            else:
+                if days_by_date is None:
+                    # Fetch the rest of the month in one listing rather than a call per day
+                    days_by_date = self._list_events_by_day(
+                        date_to_check, max_days_to_check - days_checked + 1
+                    )
+                events_result = {'items': days_by_date.get(date_to_check.date(), [])}
             
             # Get available times using base platform method
             timestamp = date_to_check.replace(
                 hour=DEFAULT_START_HOUR,
                 minute=0,
-                second=0
-            ).strftime('%Y-%m-%dT%H:%M:%S')
+                second=0,
+                microsecond=0
+            ).isoformat()
             
             availability_object = self.get_available_times(
                 timestamp,
@@ -176,12 +233,11 @@ class GoogleCalendarPlatform(BookingPlatform):
                 duration
             )
 
-            # If no slots found and no specific date was given, check next day
+            # If no slots found, check next day
             date_to_check += timedelta(days=1)
-            days_checked += 1
 
             # If we found available times
-            print(f"Availability object: {availability_object}")
+            logger.debug("Availability object: %s", availability_object)
             if availability_object['availability_found']:
                 # if requested date has times
                 if days_checked == 1:
@@ -217,15 +273,17 @@ class GoogleCalendarPlatform(BookingPlatform):
                     - name: String, customer's name
         """
         try:
-            # Get events from now onwards
-            now = datetime.utcnow()
+            # Get events from now onwards; the formatter expects naive local time
+            now = datetime.now(self.timezone).replace(tzinfo=None)
             
             events_result = self.service.events().list(
                 calendarId=CALENDAR_ID,
                 timeMin=self._format_datetime_for_google(now),
                 singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+                orderBy='startTime',
+                maxResults=_MAX_RESULTS,
+                fields=_EVENT_LIST_FIELDS
+            ).execute(num_retries=_READ_RETRIES)
 
             appointments = []
             message = "The caller has no appointments booked."
@@ -274,16 +332,7 @@ class GoogleCalendarPlatform(BookingPlatform):
             target_time = datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S')
             
             # Get events for the day
-            start_of_day = target_time.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_of_day = target_time.replace(hour=23, minute=59, second=59, microsecond=999999)
-            
-            events_result = self.service.events().list(
-                calendarId=CALENDAR_ID,
-                timeMin=self._format_datetime_for_google(start_of_day),
-                timeMax=self._format_datetime_for_google(end_of_day),
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+            events_result = self._list_day_events(target_time)
 
             # Find the matching event
             for event in events_result.get('items', []):
@@ -316,11 +365,13 @@ class GoogleCalendarPlatform(BookingPlatform):
                 'message': f'Error cancelling appointment: {str(e)}'
             }
 
-
     def reschedule_appointment(self, name: str, phone_number: str, old_timestamp: str, new_timestamp: str) -> dict:
         """
         Reschedule an existing appointment to a new time.
         
+        The existing event is moved in place with events().patch, so the
+        appointment is never cancelled before its new time is secured.
+        
         Args:
             name: String name for the calendar event
             phone_number: String phone number
@@ -331,32 +382,67 @@ class GoogleCalendarPlatform(BookingPlatform):
             dict with:
                 success: bool
                 message: str
+                otherAvailableTimes: str (if new time is taken)
         """
         try:
-            # First try to book the new appointment
-            booking_result = self.book_appointment(
-                name=name,
-                timestamp=new_timestamp,
-                phone_number=phone_number
-            )
-            
-            if not booking_result['success']:
-                return booking_result
+            old_time = datetime.strptime(old_timestamp, '%Y-%m-%dT%H:%M:%S')
+            new_time = datetime.strptime(new_timestamp, '%Y-%m-%dT%H:%M:%S')
+            if not (DEFAULT_START_HOUR <= new_time.hour < DEFAULT_END_HOUR):
+                return {
+                    'success': False,
+                    'message': f'Appointments must be between {DEFAULT_START_HOUR}:00 and {DEFAULT_END_HOUR}:00'
+                }
             
-            # If new booking succeeds, cancel the old appointment
-            cancel_result = self.cancel_appointment(
-                timestamp=old_timestamp,
-                phone_number=phone_number
-            )
+            # Find the existing appointment, matched the same way as cancel_appointment
+            old_day_events = self._list_day_events(old_time)
+            appointment = None
+            for event in old_day_events.get('items', []):
+                if ('dateTime' in event['start'] and
+                    self._strip_timezone(event['start']['dateTime']) == old_time and
+                    f'Phone: {phone_number}' in event.get('description', '')):
+                    appointment = event
+                    break
+            if appointment is None:
+                return {
+                    'success': False,
+                    'message': 'No matching appointment found'
+                }
             
-            if not cancel_result['success']:
-                # If cancellation fails, try to cancel the new appointment to maintain consistency
-                self.cancel_appointment(timestamp=new_timestamp, phone_number=phone_number)
+            # Keep the appointment's length; ignore the appointment itself when checking conflicts
+            length = (self._strip_timezone(appointment['end']['dateTime']) -
+                      self._strip_timezone(appointment['start']['dateTime']))
+            new_end = new_time + length
+            if new_time.date() == old_time.date():
+                new_day_events = old_day_events
+            else:
+                new_day_events = self._list_day_events(new_time)
+            if self._has_conflict(new_day_events, new_time, new_end, ignore_event_id=appointment['id']):
+                available_times = self.get_availability(
+                    date=new_timestamp,
+                    duration=int(length.total_seconds()) // 60
+                )
                 return {
                     'success': False,
-                    'message': f"Failed to cancel old appointment: {cancel_result['message']}"
+                    'message': 'Time slot is already booked',
+                    'otherAvailableTimes': available_times['message'],
                 }
             
+            self.service.events().patch(
+                calendarId=CALENDAR_ID,
+                eventId=appointment['id'],
+                body={
+                    'summary': name,
+                    'start': {
+                        'dateTime': self._format_datetime_for_google(new_time),
+                        'timeZone': 'America/New_York',
+                    },
+                    'end': {
+                        'dateTime': self._format_datetime_for_google(new_end),
+                        'timeZone': 'America/New_York',
+                    },
+                }
+            ).execute()
+            
             return {
                 'success': True,
                 'message': 'Appointment rescheduled successfully'
@@ -367,4 +453,3 @@ class GoogleCalendarPlatform(BookingPlatform):
                 'success': False,
                 'message': f'Error rescheduling appointment: {str(e)}'
             }
-
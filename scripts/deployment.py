@@ -1,4 +1,6 @@
+import compileall
 import os
+import py_compile
 import shutil
 import subprocess
 import sys
@@ -8,13 +10,24 @@ import argparse
 # Usage:
 # python scripts/create_deployment_package.py             # Uses existing venv if available
 # python scripts/create_deployment_package.py --fresh-venv  # Creates new venv from scratch
+# python scripts/create_deployment_package.py --python-version 3.12  # Target another Lambda runtime
+#
+# The package needs token.json. Checkouts that still have the old token.pickle
+# convert it once with:  python scripts/migrate_token.py
+# or create a fresh one with:  python scripts/regenerate_token.py
 
-def create_deployment_package(recreate_venv=False):
+# Python version of the Lambda runtime the package is built for
+LAMBDA_PYTHON_VERSION = '3.11'
+# Lambda runs on x86_64 Amazon Linux; compiled wheels (orjson) must match it
+LAMBDA_PLATFORM = 'manylinux2014_x86_64'
+
+def create_deployment_package(recreate_venv=False, python_version=LAMBDA_PYTHON_VERSION):
     """
     Create a deployment package for AWS Lambda
     
     Args:
         recreate_venv: Boolean, if True recreates virtual environment, if False uses existing one
+        python_version: String Lambda runtime version that dependency wheels are selected for
     """
     # Get the project root directory (parent of scripts directory)
     root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -24,6 +37,12 @@ def create_deployment_package(recreate_venv=False):
     package_dir = os.path.join(root_dir, 'package')
     zip_file = os.path.join(root_dir, 'deployment_package.zip')
     
+    # Fail before building anything if the token was never migrated from pickle
+    if not os.path.exists('token.json'):
+        if os.path.exists('token.pickle'):
+            sys.exit("token.json not found; convert token.pickle with: python scripts/migrate_token.py")
+        sys.exit("token.json not found; create one with: python scripts/regenerate_token.py")
+    
     try:
         print("Creating deployment package...")
         
@@ -56,19 +75,38 @@ def create_deployment_package(recreate_venv=False):
         shutil.copy('lambda_function.py', f'{package_dir}/lambda_function.py')
         shutil.copy('constants.py', f'{package_dir}/constants.py')
         shutil.copy('auth.py', f'{package_dir}/auth.py')
-        shutil.copy('token.pickle', os.path.join(package_dir, 'token.pickle'))
+        # copyfile drops the owner-only mode so the Lambda runtime user can read it
+        shutil.copyfile('token.json', os.path.join(package_dir, 'token.json'))
         shutil.copy2('credentials.json', package_dir)
         
-        # Install dependencies to the package directory using the virtual environment
+        # Install dependencies to the package directory using the virtual environment.
+        # Wheels are picked for the Lambda platform, not this machine, so a
+        # package built on macOS or Windows still imports orjson on Lambda
         subprocess.check_call([
             pip_path, 'install',
             '--target', package_dir,
+            '--platform', LAMBDA_PLATFORM,
+            '--implementation', 'cp',
+            '--python-version', python_version,
+            '--only-binary=:all:',
             'google-api-python-client',
             'google-auth-httplib2',
             'google-auth-oauthlib',
-            'pytz'
+            'orjson',
+            'tzdata'  # zoneinfo's fallback if the runtime image has no system tz database
         ])
         
+        # Ship bytecode so cold starts skip compiling sources (pip already
+        # compiled the dependencies). __pycache__ files are tagged with this
+        # interpreter's version and are only used if it matches the Lambda runtime.
+        # Zip entries keep mtimes at 2-second resolution, so timestamp-checked
+        # .pyc files would look stale; unchecked hashes are trusted as-is.
+        compileall.compile_dir(
+            package_dir,
+            quiet=1,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH
+        )
+        
         # Create the zip file
         if os.path.exists(zip_file):
             os.remove(zip_file)
@@ -85,9 +123,11 @@ def main():
     parser = argparse.ArgumentParser(description='Create Lambda deployment package')
     parser.add_argument('--fresh-venv', action='store_true', 
                       help='Create fresh virtual environment (default: False)')
+    parser.add_argument('--python-version', default=LAMBDA_PYTHON_VERSION,
+                      help=f'Lambda runtime Python version (default: {LAMBDA_PYTHON_VERSION})')
     args = parser.parse_args()
     
-    create_deployment_package(recreate_venv=args.fresh_venv)
+    create_deployment_package(recreate_venv=args.fresh_venv, python_version=args.python_version)
 
 if __name__ == '__main__':
     main()
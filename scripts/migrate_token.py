@@ -0,0 +1,27 @@
+import sys
+import os
+import pickle
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth import save_credentials
+from constants import TOKEN_FILE
+
+# Token format used before credentials were stored as JSON
+LEGACY_TOKEN_FILE = 'token.pickle'
+
+def migrate_token():
+    """Convert a legacy token.pickle into token.json, keeping its refresh token."""
+    if not os.path.exists(LEGACY_TOKEN_FILE):
+        sys.exit(f"No {LEGACY_TOKEN_FILE} found; run scripts/regenerate_token.py instead")
+    
+    # Only ever load the pickle this project wrote itself
+    with open(LEGACY_TOKEN_FILE, 'rb') as token:
+        creds = pickle.load(token)
+    
+    # Save the credentials
+    save_credentials(creds, TOKEN_FILE)
+    print(f"Wrote {TOKEN_FILE}; {LEGACY_TOKEN_FILE} can now be deleted")
+
+if __name__ == '__main__':
+    migrate_token()
@@ -4,15 +4,13 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-import pickle
-from constants import GOOGLE_CALENDAR_SCOPES
+from auth import save_credentials
+from constants import CREDENTIALS_FILE, GOOGLE_CALENDAR_SCOPES, TOKEN_FILE
 
 def regenerate_token():
     """Generate new token with offline access."""
     flow = InstalledAppFlow.from_client_secrets_file(
-        'credentials.json',
+        CREDENTIALS_FILE,
         GOOGLE_CALENDAR_SCOPES
     )
     
@@ -24,8 +22,7 @@ def regenerate_token():
     )
     
     # Save the credentials
-    with open('token.pickle', 'wb') as token:
-        pickle.dump(creds, token)
+    save_credentials(creds, TOKEN_FILE)
 
 if __name__ == '__main__':
     regenerate_token()
\ No newline at end of file
@@ -4,15 +4,23 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 
 import pytest
 from unittest.mock import Mock, patch
-import json
 from handlers.appointment_handlers import (
     handle_book_appointment,
     handle_get_availability,
     handle_get_appointments,
     handle_cancel_appointment,
-    handle_reschedule_appointment
+    handle_reschedule_appointment,
+    _create_platform,
+    _get_platform
 )
 
+@pytest.fixture(autouse=True)
+def clear_platform_cache():
+    """Make each test build its platform through the patched factory"""
+    _create_platform.cache_clear()
+    yield
+    _create_platform.cache_clear()
+
 @pytest.fixture
 def mock_platform():
     platform = Mock()
@@ -91,6 +99,42 @@ def test_book_appointment_slot_unavailable(mock_platform):
         assert len(body['available_slots']) == 2
         assert body.get('date') == '2024-03-20'
 
+def test_book_appointment_string_duration(mock_platform):
+    """Test duration sent as a string is converted to minutes"""
+    mock_platform.book_appointment.return_value = {'success': True, 'message': 'Appointment booked successfully'}
+    
+    with patch('handlers.appointment_handlers.PlatformFactory') as mock_factory:
+        mock_factory.get_platform.return_value = mock_platform
+        
+        event = {
+            'name': 'John Doe',
+            'timestamp': '2024-03-20T09:00:00',
+            'phone_number': '+1234567890',
+            'duration': '60'
+        }
+        
+        handle_book_appointment(event, 'google')
+        
+        mock_platform.book_appointment.assert_called_once_with(
+            name='John Doe',
+            timestamp='2024-03-20T09:00:00',
+            phone_number='+1234567890',
+            duration=60
+        )
+
+def test_book_appointment_invalid_duration(mock_platform):
+    """Test a non-numeric duration is rejected with ValueError"""
+    event = {
+        'name': 'John Doe',
+        'timestamp': '2024-03-20T09:00:00',
+        'phone_number': '+1234567890',
+        'duration': 'half an hour'
+    }
+    
+    with pytest.raises(ValueError):
+        handle_book_appointment(event, 'google')
+    mock_platform.book_appointment.assert_not_called()
+
 def test_get_availability_slots(mock_platform):
     """Test getting next available slots"""
     # Setup
@@ -179,10 +223,24 @@ def test_cancel_appointment(mock_platform):
         # Assert
         assert isinstance(result, dict)
         assert result.get('statusCode') == 200
-        body = json.loads(result.get('body'))  # Parse JSON string
+        body = result.get('body', {})
         assert body['success'] is True
         assert 'message' in body
         mock_platform.cancel_appointment.assert_called_once_with(
             timestamp='2024-03-20T09:00:00',
             phone_number='+1234567890'
         )
+
+def test_platform_reused_across_calls(mock_platform):
+    """Test the platform is created once and reused by later handler calls"""
+    mock_platform.get_customer_appointments.return_value = {'success': True, 'appointments': []}
+    
+    with patch('handlers.appointment_handlers.PlatformFactory') as mock_factory:
+        mock_factory.get_platform.return_value = mock_platform
+        
+        handle_get_appointments({'phone_number': '+1234567890'}, 'google')
+        handle_get_appointments({'phone_number': '+1234567890'}, 'google')
+        
+        mock_factory.get_platform.assert_called_once_with('google')
+        # Credentials are still checked on every invocation of the cached platform
+        assert mock_platform.refresh_credentials.call_count == 2
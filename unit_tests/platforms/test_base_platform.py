@@ -4,10 +4,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 
 import pytest
 from datetime import datetime, timedelta
-from platforms.base_platform import BookingPlatform
+from platforms.base_platform import BookingPlatform, _describe_runs
 from constants import DEFAULT_START_HOUR, DEFAULT_END_HOUR
 from unittest.mock import patch, Mock
-import pytz
+from zoneinfo import ZoneInfo
 
 class MockPlatform(BookingPlatform):
     """Mock platform for testing base class functionality"""
@@ -192,71 +192,41 @@ def test_reschedule_appointment():
     assert result['success'] == True
     assert 'message' in result
 
-def test_combine_events_empty():
-    """Test combining empty slot list"""
+def test_get_available_times_fully_booked():
+    """Test a fully booked day reports no available times"""
     platform = MockPlatform()
-    result = platform._combine_events([], "2099-03-20")
-    assert result == "No available times found"
+    booking_result = {'bookedEvents': {'items': [
+        {
+            'start': {'dateTime': '2099-01-15T09:00:00-05:00'},
+            'end': {'dateTime': '2099-01-15T17:00:00-05:00'}
+        }
+    ]}}
+    result = platform.get_available_times("2099-01-15T09:00:00", booking_result)
+    assert result['message'] == "No available times found on Thursday, January 15"
+    assert result['availability_found'] == False
 
-def test_combine_events_single_slot():
-    """Test combining single slot"""
-    platform = MockPlatform()
-    slots = [
-        {'start': '09:00', 'end': '09:30'}
-    ]
-    result = platform._combine_events(slots, "2099-03-20")
-    assert result == "9AM"
+def test_describe_runs_single_slot():
+    """Test describing a single slot"""
+    assert _describe_runs([(540, 540, 1)]) == "9AM"
 
-def test_combine_events_non_consecutive():
-    """Test combining non-consecutive slots"""
-    platform = MockPlatform()
-    slots = [
-        {'start': '09:00', 'end': '09:30'},
-        {'start': '10:00', 'end': '10:30'},
-        {'start': '11:00', 'end': '11:30'}
-    ]
-    result = platform._combine_events(slots, "2099-03-20")
-    assert result == "9AM, 10AM, 11AM"
+def test_describe_runs_non_consecutive():
+    """Test describing non-consecutive slots"""
+    runs = [(540, 540, 1), (600, 600, 1), (660, 660, 1)]
+    assert _describe_runs(runs) == "9AM, 10AM, 11AM"
 
-def test_combine_events_consecutive():
-    """Test combining consecutive slots"""
-    platform = MockPlatform()
-    slots = [
-        {'start': '10:00', 'end': '10:30'},
-        {'start': '10:30', 'end': '11:00'},
-        {'start': '11:00', 'end': '11:30'},
-        {'start': '11:30', 'end': '12:00'}
-    ]
-    result = platform._combine_events(slots, "2099-03-20")
-    assert result == "from 10AM to 11:30AM"
+def test_describe_runs_consecutive():
+    """Test describing a run of consecutive slots"""
+    assert _describe_runs([(600, 690, 4)]) == "from 10AM to 11:30AM"
 
-def test_combine_events_mixed():
-    """Test combining mix of consecutive and non-consecutive slots"""
-    platform = MockPlatform()
-    slots = [
-        {'start': '09:00', 'end': '09:30'},
-        {'start': '09:30', 'end': '10:00'},
-        {'start': '10:30', 'end': '11:00'},
-        {'start': '11:00', 'end': '11:30'},
-        {'start': '11:30', 'end': '12:00'},
-        {'start': '12:00', 'end': '12:30'},
-        {'start': '14:00', 'end': '14:30'}
-    ]
-    result = platform._combine_events(slots, "2099-03-20")
-    assert result == "9AM, 9:30AM, from 10:30AM to 12PM, 2PM"
+def test_describe_runs_mixed():
+    """Test describing a mix of consecutive and non-consecutive slots"""
+    runs = [(540, 570, 2), (630, 720, 4), (840, 840, 1)]
+    assert _describe_runs(runs) == "9AM, 9:30AM, from 10:30AM to 12PM, 2PM"
 
-def test_combine_events_pm_times():
-    """Test combining slots in PM time"""
-    platform = MockPlatform()
-    slots = [
-        {'start': '13:00', 'end': '13:30'},
-        {'start': '13:30', 'end': '14:00'},
-        {'start': '14:00', 'end': '14:30'},
-        {'start': '14:30', 'end': '15:00'},
-        {'start': '16:00', 'end': '16:30'}
-    ]
-    result = platform._combine_events(slots, "2099-03-20")
-    assert result == "from 1PM to 2:30PM, 4PM"
+def test_describe_runs_pm_times():
+    """Test describing slots in PM time"""
+    runs = [(780, 870, 4), (960, 960, 1)]
+    assert _describe_runs(runs) == "from 1PM to 2:30PM, 4PM"
 
 def test_get_available_times_filters_past_dates():
     """Test that get_available_times shows no slots for past dates"""
@@ -268,6 +238,7 @@ def test_get_available_times_filters_past_dates():
         mock_now.replace.return_value = real_now
         mock_dt.now.return_value = mock_now
         mock_dt.strptime = datetime.strptime
+        mock_dt.fromisoformat = datetime.fromisoformat
         
         past_result = platform.get_available_times(
             "2024-03-19T10:00:00",  # Yesterday
@@ -280,7 +251,7 @@ def test_get_available_times_filters_past_hours_today():
     platform = MockPlatform()
     
     fixed_date = datetime(2024, 3, 20, 10, 0)
-    fixed_date_eastern = pytz.timezone('America/New_York').localize(fixed_date)
+    fixed_date_eastern = fixed_date.replace(tzinfo=ZoneInfo('America/New_York'))
     
     with patch('datetime.datetime') as mock_datetime, \
          patch('platforms.base_platform.datetime') as mock_platform_dt, \
@@ -292,6 +263,7 @@ def test_get_available_times_filters_past_hours_today():
         
         mock_platform_dt.now.return_value = fixed_date_eastern
         mock_platform_dt.strptime.side_effect = datetime.strptime
+        mock_platform_dt.fromisoformat.side_effect = datetime.fromisoformat
         
         mock_google_dt.now.return_value = fixed_date_eastern
         mock_google_dt.strptime.side_effect = datetime.strptime
@@ -302,5 +274,49 @@ def test_get_available_times_filters_past_hours_today():
         )
         assert today_result['message'] == "Available Wednesday, March 20: from 10:30AM to 4:30PM"
 
+def test_get_available_times_event_crossing_midnight():
+    """Test that an event running past midnight blocks the morning of the next day"""
+    platform = MockPlatform()
+    booking_result = {'bookedEvents': {'items': [
+        {
+            'start': {'dateTime': '2099-01-14T22:00:00-05:00'},
+            'end': {'dateTime': '2099-01-15T10:00:00-05:00'}
+        }
+    ]}}
+    result = platform.get_available_times("2099-01-15T09:00:00", booking_result)
+    assert result['message'] == "Available Thursday, January 15: from 10AM to 4:30PM"
+
+def test_get_available_times_unsorted_overlapping_events():
+    """Test that unsorted and overlapping booked events are all respected"""
+    platform = MockPlatform()
+    booking_result = {'bookedEvents': {'items': [
+        {
+            'start': {'dateTime': '2099-01-15T13:00:00-05:00'},
+            'end': {'dateTime': '2099-01-15T14:00:00-05:00'}
+        },
+        {
+            'start': {'dateTime': '2099-01-15T09:00:00-05:00'},
+            'end': {'dateTime': '2099-01-15T10:30:00-05:00'}
+        },
+        {
+            'start': {'dateTime': '2099-01-15T10:00:00-05:00'},
+            'end': {'dateTime': '2099-01-15T11:00:00-05:00'}
+        }
+    ]}}
+    result = platform.get_available_times("2099-01-15T09:00:00", booking_result)
+    assert result['message'] == "Available Thursday, January 15: from 11AM to 12:30PM, from 2PM to 4:30PM"
+
+def test_get_available_times_longer_duration_not_grouped():
+    """Test that overlapping hour-long slots on the half-hour grid are listed individually"""
+    platform = MockPlatform()
+    booking_result = {'bookedEvents': {'items': [
+        {
+            'start': {'dateTime': '2099-01-15T10:00:00-05:00'},
+            'end': {'dateTime': '2099-01-15T15:00:00-05:00'}
+        }
+    ]}}
+    result = platform.get_available_times("2099-01-15T09:00:00", booking_result, duration=60)
+    assert result['message'] == "Available Thursday, January 15: 9AM, 3PM, 3:30PM, 4PM"
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v', '-s'])
\ No newline at end of file
@@ -7,7 +7,7 @@ from unittest.mock import Mock, patch
 from datetime import datetime, timedelta
 from platforms.google_calendar import GoogleCalendarPlatform
 from constants import CALENDAR_ID, DEFAULT_START_HOUR, DEFAULT_END_HOUR
-import pytz
+from zoneinfo import ZoneInfo
 
 @pytest.fixture
 def mock_service():
@@ -39,6 +39,23 @@ def platform(mock_service):
     platform.service = mock_service
     return platform
 
+def test_refresh_credentials_refreshes_shared_credentials():
+    """Test a warm platform re-checks its credentials through auth's cache"""
+    creds = Mock()
+    with patch('platforms.google_calendar.get_credentials', return_value=creds) as mock_get, \
+         patch('platforms.google_calendar.build') as mock_build:
+        platform = GoogleCalendarPlatform()
+        platform.refresh_credentials()
+    
+    assert mock_get.call_count == 2
+    assert mock_build.call_args.kwargs['credentials'] is creds
+
+def test_refresh_credentials_skipped_in_test_mode(platform):
+    """Test unit-test platforms never touch stored credentials"""
+    with patch('platforms.google_calendar.get_credentials') as mock_get:
+        platform.refresh_credentials()
+    mock_get.assert_not_called()
+
 def test_book_appointment_success(platform, mock_service):
     """Test successful appointment booking"""
     # Mock the events().insert().execute() chain
@@ -58,13 +75,20 @@ def test_book_appointment_success(platform, mock_service):
     
     assert result['success'] == True
     assert 'message' in result
+    body = events.insert.call_args.kwargs['body']
+    assert body['description'] == 'Phone: +1234567890'
+    assert body['extendedProperties'] == {'private': {'phone': '+1234567890'}}
+    # Conflict check only lists events overlapping the requested slot
+    list_kwargs = events.list.call_args.kwargs
+    assert list_kwargs['timeMin'] == '2024-03-20T14:00:00.000Z'
+    assert list_kwargs['timeMax'] == '2024-03-20T14:30:00.000Z'
 
 def test_book_appointment_conflict(platform, mock_service):
     """Test booking when time slot is already taken"""
     # Mock current time to be March 20th, 2024
     real_datetime = datetime
     fixed_date = real_datetime(2024, 3, 20, 8, 0)  # 8 AM
-    fixed_date_eastern = pytz.timezone('America/New_York').localize(fixed_date)
+    fixed_date_eastern = fixed_date.replace(tzinfo=ZoneInfo('America/New_York'))
     
     # Mock the events().list().execute() chain to show a conflict
     events_list = Mock()
@@ -107,7 +131,7 @@ def test_book_appointment_conflict_entire_day(platform, mock_service):
     # Mock current time to be March 20th, 2024
     real_datetime = datetime
     fixed_date = real_datetime(2024, 3, 20, 8, 0)  # 8 AM
-    fixed_date_eastern = pytz.timezone('America/New_York').localize(fixed_date)
+    fixed_date_eastern = fixed_date.replace(tzinfo=ZoneInfo('America/New_York'))
     
     # Create two different return values
     first_response = {
@@ -187,6 +211,27 @@ def test_get_customer_appointments(platform, mock_service):
     assert appointments == 'The caller has appointments booked for March 20 at 09:00AM'
 
 
+def test_get_customer_appointments_lists_from_now(platform, mock_service):
+    """Test the customer lookup starts at the current local time"""
+    events = Mock()
+    events.list.return_value.execute.return_value = {'items': []}
+    mock_service.events.return_value = events
+    
+    fixed_date_eastern = datetime(2099, 1, 15, 10, 0, tzinfo=ZoneInfo('America/New_York'))
+    
+    class MockDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return fixed_date_eastern if tz is None else fixed_date_eastern.astimezone(tz)
+    
+    with patch('platforms.google_calendar.datetime', MockDateTime):
+        result = platform.get_customer_appointments(phone_number="+1234567890")
+    
+    assert result['message'] == 'The caller has no appointments booked.'
+    assert events.list.call_args.kwargs['timeMin'] == '2099-01-15T15:00:00.000Z'
+    # Matching is done on the exact description, not Google's fuzzy search
+    assert 'q' not in events.list.call_args.kwargs
+
 def test_cancel_appointment_success(platform, mock_service):
     """Test successful appointment cancellation"""
     # Mock the events().list().execute() chain for phone verification
@@ -236,6 +281,89 @@ def test_cancel_appointment_not_found(platform, mock_service):
     assert result['success'] == False
     assert 'no matching appointment' in result['message'].lower()
 
+def test_reschedule_appointment_success(platform, mock_service):
+    """Test rescheduling moves the existing event with a single patch"""
+    events = Mock()
+    events.list.return_value.execute.return_value = {
+        'items': [
+            {
+                'id': 'test_event_id',
+                'description': 'Phone: +1234567890',
+                'start': {'dateTime': '2099-01-15T10:00:00-05:00'},
+                'end': {'dateTime': '2099-01-15T11:00:00-05:00'}
+            }
+        ]
+    }
+    mock_service.events.return_value = events
+    
+    result = platform.reschedule_appointment(
+        name="John Doe",
+        phone_number="+1234567890",
+        old_timestamp="2099-01-15T10:00:00",
+        new_timestamp="2099-01-15T10:30:00"  # Overlaps only the appointment itself
+    )
+    
+    assert result['success'] == True, f"Reschedule failed: {result['message']}"
+    events.patch.assert_called_once()
+    kwargs = events.patch.call_args.kwargs
+    assert kwargs['eventId'] == 'test_event_id'
+    assert kwargs['body']['start']['dateTime'] == '2099-01-15T15:30:00.000Z'
+    assert kwargs['body']['end']['dateTime'] == '2099-01-15T16:30:00.000Z'  # Keeps the hour length
+    events.insert.assert_not_called()
+    events.delete.assert_not_called()
+
+def test_reschedule_appointment_not_found(platform, mock_service):
+    """Test rescheduling an appointment that does not exist"""
+    events = Mock()
+    events.list.return_value.execute.return_value = {'items': []}
+    mock_service.events.return_value = events
+    
+    result = platform.reschedule_appointment(
+        name="John Doe",
+        phone_number="+1234567890",
+        old_timestamp="2099-01-15T10:00:00",
+        new_timestamp="2099-01-15T11:00:00"
+    )
+    
+    assert result['success'] == False
+    assert 'no matching appointment' in result['message'].lower()
+    events.patch.assert_not_called()
+
+def test_reschedule_appointment_conflict(platform, mock_service):
+    """Test rescheduling onto a booked slot leaves the appointment in place"""
+    events = Mock()
+    events.list.return_value.execute.return_value = {
+        'items': [
+            {
+                'id': 'test_event_id',
+                'description': 'Phone: +1234567890',
+                'start': {'dateTime': '2099-01-15T10:00:00-05:00'},
+                'end': {'dateTime': '2099-01-15T10:30:00-05:00'}
+            },
+            {
+                'id': 'other_event_id',
+                'description': 'Phone: +0987654321',
+                'start': {'dateTime': '2099-01-15T14:00:00-05:00'},
+                'end': {'dateTime': '2099-01-15T14:30:00-05:00'}
+            }
+        ]
+    }
+    mock_service.events.return_value = events
+    
+    with patch.object(GoogleCalendarPlatform, 'get_availability',
+                      return_value={'message': 'Available Thursday, January 15: 9AM'}):
+        result = platform.reschedule_appointment(
+            name="John Doe",
+            phone_number="+1234567890",
+            old_timestamp="2099-01-15T10:00:00",
+            new_timestamp="2099-01-15T14:00:00"
+        )
+    
+    assert result['success'] == False
+    assert result['message'] == 'Time slot is already booked'
+    assert result['otherAvailableTimes'] == 'Available Thursday, January 15: 9AM'
+    events.patch.assert_not_called()
+
 def test_get_availability_no_conflicts(platform, mock_service):
     """Test getting available slots for a day with no conflicts"""
     events = Mock()
@@ -278,6 +406,34 @@ def test_get_availability_with_conflicts(platform, mock_service):
     # Check that the string contains expected format
     assert result['message'] == "Available Friday, March 20: from 10AM to 1:30PM, from 3PM to 4:30PM"
 
+def test_get_availability_lists_later_days_once(platform, mock_service):
+    """Test days after a fully booked date come from a single listing"""
+    events = Mock()
+    events.list.return_value.execute.side_effect = [
+        {'items': [  # Requested day is fully booked
+            {
+                'start': {'dateTime': '2099-01-15T09:00:00-05:00'},
+                'end': {'dateTime': '2099-01-15T17:00:00-05:00'}
+            }
+        ]},
+        {'items': [  # One listing covering the following days
+            {
+                'start': {'dateTime': '2099-01-16T09:00:00-05:00'},
+                'end': {'dateTime': '2099-01-16T12:00:00-05:00'}
+            }
+        ]}
+    ]
+    mock_service.events.return_value = events
+    
+    result = platform.get_availability(duration=30, date="2099-01-15")
+    assert result['success'] == True
+    assert result['message'] == "Requested date unavailable, but there is availability on: Available Friday, January 16: from 12PM to 4:30PM"
+    assert events.list.call_count == 2
+    assert events.list.call_args.kwargs['timeMin'] == '2099-01-16T05:00:00.000Z'
+    assert events.list.call_args.kwargs['timeMax'] == '2099-02-14T05:00:00.000Z'
+    # Reads are retried with backoff on transient errors
+    events.list.return_value.execute.assert_called_with(num_retries=3)
+
 def test_outside_business_hours(platform):
     """Test booking outside business hours"""
     result = platform.book_appointment(
@@ -299,6 +455,7 @@ def test_get_availability_today_filters_past_times(platform, mock_service):
         mock_now.replace.return_value = real_now
         mock_dt.now.return_value = mock_now
         mock_dt.strptime = datetime.strptime
+        mock_dt.fromisoformat = datetime.fromisoformat
         
         # Mock no existing appointments
         events = Mock()
@@ -315,7 +472,7 @@ def test_get_availability_no_date_provided(platform, mock_service):
     """Test getting available slots when no date is provided (should default to today)"""
     # Mock current time to be 9:30 AM on March 20, 2024
     fixed_date = datetime(2024, 3, 20, 9, 30)
-    fixed_date_eastern = pytz.timezone('America/New_York').localize(fixed_date)
+    fixed_date_eastern = fixed_date.replace(tzinfo=ZoneInfo('America/New_York'))
     
     with patch('datetime.datetime') as mock_datetime, \
          patch('platforms.base_platform.datetime') as mock_platform_dt, \
@@ -327,6 +484,7 @@ def test_get_availability_no_date_provided(platform, mock_service):
         
         mock_platform_dt.now.return_value = fixed_date_eastern
         mock_platform_dt.strptime.side_effect = datetime.strptime
+        mock_platform_dt.fromisoformat.side_effect = datetime.fromisoformat
         
         mock_google_dt.now.return_value = fixed_date_eastern
         mock_google_dt.strptime.side_effect = datetime.strptime
@@ -346,7 +504,7 @@ def test_get_availability_today_given_as_date(platform, mock_service):
     """Test getting available slots when no date is provided (should default to today)"""
     # Mock current time to be 9:30 AM on March 20, 2024
     fixed_date = datetime(2024, 3, 20, 9, 30)
-    fixed_date_eastern = pytz.timezone('America/New_York').localize(fixed_date)
+    fixed_date_eastern = fixed_date.replace(tzinfo=ZoneInfo('America/New_York'))
     
     with patch('datetime.datetime') as mock_datetime, \
          patch('platforms.base_platform.datetime') as mock_platform_dt, \
@@ -358,6 +516,7 @@ def test_get_availability_today_given_as_date(platform, mock_service):
         
         mock_platform_dt.now.return_value = fixed_date_eastern
         mock_platform_dt.strptime.side_effect = datetime.strptime
+        mock_platform_dt.fromisoformat.side_effect = datetime.fromisoformat
         
         mock_google_dt.now.return_value = fixed_date_eastern
         mock_google_dt.strptime.side_effect = datetime.strptime
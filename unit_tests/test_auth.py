@@ -0,0 +1,65 @@
+import sys
+import os
+import stat
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+import auth
+
+@pytest.fixture(autouse=True)
+def clear_cached_creds():
+    """Reset the module-level credentials cache between tests"""
+    auth._CACHED_CREDS = None
+    yield
+    auth._CACHED_CREDS = None
+
+def test_save_credentials_owner_only(tmp_path):
+    """Test token file is written atomically with 0600 permissions"""
+    creds = Mock()
+    creds.to_json.return_value = '{"token": "abc"}'
+    token_path = str(tmp_path / 'token.json')
+    
+    auth.save_credentials(creds, token_path)
+    
+    with open(token_path) as token:
+        assert token.read() == '{"token": "abc"}'
+    assert stat.S_IMODE(os.stat(token_path).st_mode) == 0o600
+    assert not os.path.exists(token_path + '.tmp')
+
+def test_get_credentials_uses_cache():
+    """Test valid cached credentials are returned without touching disk"""
+    creds = Mock(valid=True)
+    creds.expiry = datetime.utcnow() + timedelta(minutes=30)
+    auth._CACHED_CREDS = creds
+    
+    with patch('auth.os.path.exists') as mock_exists:
+        assert auth.get_credentials() is creds
+        mock_exists.assert_not_called()
+
+def test_get_credentials_refreshes_before_expiry():
+    """Test cached credentials close to expiry are refreshed and saved"""
+    creds = Mock(valid=True, refresh_token='refresh')
+    creds.expiry = datetime.utcnow() + timedelta(minutes=2)
+    auth._CACHED_CREDS = creds
+    
+    with patch('auth.save_credentials') as mock_save:
+        assert auth.get_credentials() is creds
+        creds.refresh.assert_called_once()
+        mock_save.assert_called_once_with(creds, '/tmp/token.json')
+
+def test_get_credentials_near_expiry_without_refresh_token():
+    """Test valid credentials that cannot be refreshed are used as-is, not re-authorized"""
+    creds = Mock(valid=True, refresh_token=None)
+    creds.expiry = datetime.utcnow() + timedelta(minutes=3)
+    auth._CACHED_CREDS = creds
+    
+    with patch('auth.InstalledAppFlow.from_client_secrets_file') as mock_flow, \
+         patch('auth.save_credentials') as mock_save:
+        assert auth.get_credentials() is creds
+        mock_flow.assert_not_called()
+        mock_save.assert_not_called()
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v', '-s'])
@@ -31,6 +31,16 @@ def test_missing_platform():
     body = json.loads(result['body'])
     assert 'Platform is required' in body, f"Expected error message not found in response: {body}"
 
+def test_error_response_not_shared():
+    """Test mutating one error response does not leak into the next invocation"""
+    event = {'google': ''}
+    
+    first = lambda_handler(event, None)
+    first['body'] = 'mutated'
+    second = lambda_handler(event, None)
+    
+    assert json.loads(second['body']) == 'Operation is required'
+
 def test_unknown_operation():
     """Test handler returns 400 for unknown operation"""
     event = {
@@ -43,6 +53,59 @@ def test_unknown_operation():
     body = json.loads(result['body'])
     assert 'Operation is required' in body, f"Expected error message not found in response: {body}"
 
+def test_first_operation_in_event_order_wins():
+    """Test the operation key that comes first in the event is used"""
+    event = {
+        'google': '',
+        'get_availability': '',
+        'book_appointment': 'create'
+    }
+    
+    availability_handler = Mock(name='mock_get_availability', return_value={'statusCode': 200, 'body': {}})
+    booking_handler = Mock(name='mock_book_appointment', return_value={'statusCode': 200, 'body': {}})
+    mock_handlers = {
+        'book_appointment': ((), booking_handler),
+        'get_availability': ((), availability_handler)
+    }
+    
+    with patch('lambda_function.HANDLERS', mock_handlers):
+        result = lambda_handler(event, None)
+    
+    assert result['statusCode'] == 200
+    availability_handler.assert_called_once_with(event, 'google')
+    booking_handler.assert_not_called()
+
+def test_missing_required_fields():
+    """Test handler returns 400 listing required fields absent from the event"""
+    event = {
+        'book_appointment': 'create',
+        'google': '',
+        'name': 'John Doe'
+    }
+    
+    result = lambda_handler(event, None)
+    assert result['statusCode'] == 400
+    body = json.loads(result['body'])
+    assert body == 'Missing required fields: timestamp, phone_number', f"Unexpected error message: {body}"
+
+def test_api_gateway_bytes_body():
+    """Test API Gateway events with a bytes body are parsed"""
+    event = {
+        'body': json.dumps({'args': {'google': '', 'name': 'John Doe'}}).encode()
+    }
+    
+    result = lambda_handler(event, None)
+    assert result['statusCode'] == 400
+    body = json.loads(result['body'])
+    assert 'Operation is required' in body, f"Expected error message not found in response: {body}"
+
+def test_api_gateway_empty_body():
+    """Test API Gateway events with an empty body are rejected without parsing"""
+    result = lambda_handler({'body': ''}, None)
+    assert result['statusCode'] == 400
+    body = json.loads(result['body'])
+    assert 'Platform is required' in body, f"Expected error message not found in response: {body}"
+
 def test_successful_booking():
     """Test successful booking operation"""
     event = {
@@ -55,7 +118,7 @@ def test_successful_booking():
     
     mock_response = {
         'statusCode': 200,
-        'body': json.dumps({
+        'body': {
             'success': True,
             'message': 'Appointment booked successfully',
             'event_id': 'mock_event_123',
@@ -64,7 +127,7 @@ def test_successful_booking():
             'bookedEvents': {
                 'items': []
             }
-        })
+        }
     }
     
     # Create a mock handler that returns our success response
@@ -72,7 +135,7 @@ def test_successful_booking():
     mock_handler.return_value = mock_response
     
     mock_handlers = {
-        'book_appointment': mock_handler
+        'book_appointment': ((), mock_handler)
     }
     
     # Stack multiple patches to catch all possible import paths
@@ -90,6 +153,13 @@ def test_successful_booking():
         assert 'event_link' in body, "Should include event_link"
         assert 'timestamp' in body, "Should include timestamp"
         mock_handler.assert_called_once_with(event, 'google')
+        assert event == {
+            'book_appointment': 'create',
+            'google': '',
+            'name': 'John Doe',
+            'timestamp': '2024-03-20T09:00:00',
+            'phone_number': '+1234567890'
+        }, "Caller's event should not be mutated"
 
 def test_general_error_handling():
     """Test handler returns 500 for unexpected errors"""
@@ -106,7 +176,7 @@ def test_general_error_handling():
     mock_handler.side_effect = Exception("Test error")
     
     mock_handlers = {
-        'book_appointment': mock_handler
+        'book_appointment': ((), mock_handler)
     }
     
     # Stack multiple patches to catch all possible import paths
@@ -132,7 +202,7 @@ def test_value_error_handling():
     mock_handler.side_effect = ValueError('Invalid input')
     
     mock_handlers = {
-        'book_appointment': mock_handler
+        'book_appointment': ((), mock_handler)
     }
     
     # Stack multiple patches to catch all possible import paths